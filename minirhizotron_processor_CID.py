@@ -7,26 +7,32 @@ import os
 import math
 import glob
 import re
+from concurrent.futures import ThreadPoolExecutor
 from scipy.interpolate import interp1d
 
+# Position number of a tube segment in its file name (L001, L002, etc.)
+_POS_RE = re.compile(r"L(\d+)")
 
-def combine_tube_images(
-    input_dir,
-    pattern="*L???.png",
-    output_path="combined_tube.png",
-    stitch_direction="vertical",
-):
-    """
-    Combines multiple tube images into a single continuous image.
 
-    Args:
-        input_dir (str): Directory containing the tube segment images
-        pattern (str): Glob pattern to match the image files
-        output_path (str): Path to save the combined image
-        stitch_direction (str): "vertical" or "horizontal" stitching
+def _load_font(size):
+    """Load the Arial label font, falling back to PIL's default if unavailable."""
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except IOError:
+        pass
+    try:
+        # Pillow >= 10.1 can scale the default font to the requested size
+        return ImageFont.load_default(size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def _combine_tube_images(input_dir, pattern, stitch_direction):
+    """
+    Stitch the tube segment images in memory; see combine_tube_images.
 
     Returns:
-        str: Path to the combined image file
+        PIL.Image.Image: The combined image
     """
     # Find all matching image files
     image_files = glob.glob(os.path.join(input_dir, pattern))
@@ -36,7 +42,7 @@ def combine_tube_images(
 
     # Sort images by their position number (L001, L002, etc.)
     def extract_position(filename):
-        match = re.search(r"L(\d+)", os.path.basename(filename))
+        match = _POS_RE.search(os.path.basename(filename))
         if match:
             return int(match.group(1))
         return 0  # Default if pattern not found
@@ -46,23 +52,68 @@ def combine_tube_images(
         f"Found {len(image_files)} images to combine: {[os.path.basename(f) for f in image_files]}"
     )
 
-    # Load all images
-    images = [Image.open(f) for f in image_files]
+    # Read image sizes from the file headers (PIL opens lazily, so no pixel
+    # data is decoded here)
+    sizes = []
+    for filename in image_files:
+        with Image.open(filename) as img:
+            sizes.append(img.size)
+
+    # Work out which images need resizing to match the most common width for
+    # vertical stitching or the most common height for horizontal stitching
+    if stitch_direction == "vertical":
+        widths = [width for width, _ in sizes]
+        common_width = max(set(widths), key=widths.count)
+        target_sizes = []
+        for width, height in sizes:
+            if width == common_width:
+                target_sizes.append(None)
+            else:
+                aspect = height / width
+                target_sizes.append((common_width, int(aspect * common_width)))
+    else:
+        heights = [height for _, height in sizes]
+        common_height = max(set(heights), key=heights.count)
+        target_sizes = []
+        for width, height in sizes:
+            if height == common_height:
+                target_sizes.append(None)
+            else:
+                aspect = width / height
+                target_sizes.append((int(aspect * common_height), common_height))
+
+    # Load all images, decoding them in parallel (PIL opens lazily, so copy()
+    # forces the full decode inside the worker thread)
+    def load_image(filename, target_size):
+        with Image.open(filename) as img:
+            # JPEGs that will be downscaled can be decoded at a reduced scale
+            if img.format == "JPEG" and target_size and target_size[0] < img.width:
+                img.draft("RGB", target_size)
+            return img.copy()
+
+    with ThreadPoolExecutor() as executor:
+        images = list(executor.map(load_image, image_files, target_sizes))
+
+    # Only use an RGBA canvas when some input actually carries transparency.
+    # Otherwise stitch on RGB, so paste converts palette, CMYK, grayscale and
+    # mixed-mode segments and the depth overlay can be drawn in colour
+    if any(
+        img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info for img in images
+    ):
+        mode = "RGBA"
+    else:
+        mode = "RGB"
 
     # Check if all images have the same width for vertical stitching or same height for horizontal
     if stitch_direction == "vertical":
-        widths = [img.width for img in images]
         if len(set(widths)) > 1:
             print(f"Warning: Images have different widths: {widths}")
             # Resize all images to match the most common width
-            common_width = max(set(widths), key=widths.count)
-            for i, img in enumerate(images):
-                if img.width != common_width:
-                    aspect = img.height / img.width
-                    new_height = int(aspect * common_width)
-                    images[i] = img.resize((common_width, new_height), Image.LANCZOS)
+            for i, (size, target_size) in enumerate(zip(sizes, target_sizes)):
+                if target_size:
+                    images[i] = images[i].resize(target_size, Image.LANCZOS)
                     print(
-                        f"Resized image {i + 1} from {img.width}x{img.height} to {common_width}x{new_height}"
+                        f"Resized image {i + 1} from {size[0]}x{size[1]} to {target_size[0]}x{target_size[1]}"
                     )
 
         # Calculate dimensions of combined image
@@ -70,7 +121,7 @@ def combine_tube_images(
         total_height = sum(img.height for img in images)
 
         # Create blank canvas for combined image
-        combined = Image.new("RGBA", (total_width, total_height), (0, 0, 0, 0))
+        combined = Image.new(mode, (total_width, total_height))
 
         # Paste each image
         y_offset = 0
@@ -79,18 +130,14 @@ def combine_tube_images(
             y_offset += img.height
 
     else:  # horizontal stitching
-        heights = [img.height for img in images]
         if len(set(heights)) > 1:
             print(f"Warning: Images have different heights: {heights}")
             # Resize all images to match the most common height
-            common_height = max(set(heights), key=heights.count)
-            for i, img in enumerate(images):
-                if img.height != common_height:
-                    aspect = img.width / img.height
-                    new_width = int(aspect * common_height)
-                    images[i] = img.resize((new_width, common_height), Image.LANCZOS)
+            for i, (size, target_size) in enumerate(zip(sizes, target_sizes)):
+                if target_size:
+                    images[i] = images[i].resize(target_size, Image.LANCZOS)
                     print(
-                        f"Resized image {i + 1} from {img.width}x{img.height} to {new_width}x{common_height}"
+                        f"Resized image {i + 1} from {size[0]}x{size[1]} to {target_size[0]}x{target_size[1]}"
                     )
 
         # Calculate dimensions of combined image
@@ -98,7 +145,7 @@ def combine_tube_images(
         total_height = max(img.height for img in images)
 
         # Create blank canvas for combined image
-        combined = Image.new("RGBA", (total_width, total_height), (0, 0, 0, 0))
+        combined = Image.new(mode, (total_width, total_height))
 
         # Paste each image
         x_offset = 0
@@ -106,8 +153,34 @@ def combine_tube_images(
             combined.paste(img, (x_offset, 0))
             x_offset += img.width
 
+    return combined
+
+
+def combine_tube_images(
+    input_dir,
+    pattern="*L???.png",
+    output_path="combined_tube.png",
+    stitch_direction="vertical",
+    compress_level=1,
+):
+    """
+    Combines multiple tube images into a single continuous image.
+
+    Args:
+        input_dir (str): Directory containing the tube segment images
+        pattern (str): Glob pattern to match the image files
+        output_path (str): Path to save the combined image
+        stitch_direction (str): "vertical" or "horizontal" stitching
+        compress_level (int): PNG compression level (0-9) for the saved images;
+            the default favours speed, pass 6 for smaller final deliverables
+
+    Returns:
+        str: Path to the combined image file
+    """
+    combined = _combine_tube_images(input_dir, pattern, stitch_direction)
+
     # Save the combined image
-    combined.save(output_path)
+    combined.save(output_path, compress_level=compress_level)
     print(f"Combined image saved to {output_path}")
 
     return output_path
@@ -123,6 +196,9 @@ def map_soil_depths_to_image(
     image_height_cm=None,  # Height of the image in cm (calculated if None)
     image_width_cm=18.0,  # Width of the image in cm
     line_thickness=3,  # Thickness of depth lines
+    dpi=200,  # Resolution of the combined visualization
+    fast_mode=True,  # Build the combined visualization with Pillow
+    compress_level=1,  # PNG compression level for the saved images
 ):
     """
     Maps horizontal soil depth levels to an unrolled cylindrical image and extracts
@@ -138,16 +214,59 @@ def map_soil_depths_to_image(
         image_height_cm (float): Physical height of the image in cm (if None, will calculate based on width)
         image_width_cm (float): Physical width of the image in cm
         line_thickness (int): Thickness of depth lines in pixels
+        dpi (int): Resolution of the combined all_depths.png visualization
+        fast_mode (bool): Build all_depths.png with Pillow instead of matplotlib
+        compress_level (int): PNG compression level (0-9) for the saved images;
+            the default favours speed, pass 6 for smaller final deliverables
 
     Returns:
         tuple: (overlay_image_path, list_of_extracted_section_paths)
     """
+    # Load the image
+    img = Image.open(image_path)
+
+    return _map_soil_depths(
+        img,
+        output_dir=output_dir,
+        cylinder_angle_deg=cylinder_angle_deg,
+        cylinder_diameter_cm=cylinder_diameter_cm,
+        depth_interval_cm=depth_interval_cm,
+        max_depth_cm=max_depth_cm,
+        image_height_cm=image_height_cm,
+        image_width_cm=image_width_cm,
+        line_thickness=line_thickness,
+        dpi=dpi,
+        fast_mode=fast_mode,
+        compress_level=compress_level,
+    )
+
+
+def _map_soil_depths(
+    img,
+    output_dir="output_soil_depths",
+    cylinder_angle_deg=45,
+    cylinder_diameter_cm=10,  # Assuming diameter, adjust as needed
+    depth_interval_cm=40,  # Interval between soil depth levels
+    max_depth_cm=200,  # Maximum soil depth to map
+    image_height_cm=None,  # Height of the image in cm (calculated if None)
+    image_width_cm=18.0,  # Width of the image in cm
+    line_thickness=3,  # Thickness of depth lines
+    dpi=200,  # Resolution of the combined visualization
+    fast_mode=True,  # Build the combined visualization with Pillow
+    compress_level=1,  # PNG compression level for the saved images
+):
+    """
+    Map soil depths onto an already loaded image; see map_soil_depths_to_image.
+
+    Args:
+        img (PIL.Image.Image): The unrolled cylindrical image
+    """
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
 
-    # Load the image
-    img = Image.open(image_path)
-    img = img.rotate(90, expand=True)  # Rotate image to match the cylinder orientation
+    # Rotate image to match the cylinder orientation and flip it so top is top and
+    # bottom is bottom (a single transpose does both)
+    img = img.transpose(Image.TRANSPOSE)
     img_width, img_height = img.size
 
     # If image_height_cm is not provided, calculate it maintaining aspect ratio
@@ -173,6 +292,9 @@ def map_soil_depths_to_image(
     overlay_img = img.copy()
     draw = ImageDraw.Draw(overlay_img)
 
+    # Load the label font once
+    font = _load_font(100)
+
     # Define colors and depth levels
     colors = [
         (255, 0, 0),
@@ -191,110 +313,118 @@ def map_soil_depths_to_image(
     if depth_levels[-1] < max_depth_cm:
         depth_levels = np.append(depth_levels, max_depth_cm)
 
-    # Calculate projection curves using the corrected angle
-    all_projection_curves = []
-
-    for depth_cm in depth_levels:
-        # Horizontal positions along the unwrapped cylinder
-        x_positions = np.linspace(0, img_width, 1000)
-        theta_positions = x_positions / img_width * 2 * np.pi
-
-        # Vertical offset due to depth (using asscent angle)
-        depth_offset = depth_cm / np.sin(asscent_angle_rad)
-
-        # Sinusoidal variation around cylinder (using descent angle)
-        angle_variation = (
-            cylinder_radius_cm * np.cos(theta_positions) / np.tan(asscent_angle_rad)
-        )
+    # Calculate projection curves using the corrected angle, in float32 since the
+    # results are only used as pixel positions
+    angle_rad = np.float32(asscent_angle_rad)
 
-        # Combine effects
-        y_positions = depth_offset + angle_variation
+    # Horizontal positions along the unwrapped cylinder (shared by every depth)
+    x_px = np.linspace(0, img_width, 1000, dtype=np.float32)
+    theta_positions = x_px / img_width * 2 * np.pi
 
-        # Convert to pixel coordinates
-        x_px = x_positions
-        y_px = img_height - (y_positions * pixels_per_cm_y)
+    # Sinusoidal variation around cylinder (independent of depth)
+    angle_variation = cylinder_radius_cm * np.cos(theta_positions) / np.tan(angle_rad)
 
-        all_projection_curves.append(list(zip(x_px, y_px)))
+    # Vertical offset due to depth (using asscent angle), one row per depth level
+    depth_offset = depth_levels.astype(np.float32)[:, None] / np.sin(angle_rad)
 
-        font = ImageFont.truetype("arial.ttf", 100)
+    # Combine effects and convert to pixel coordinates: shape (n_depths, 1000).
+    # The curves share x_px, so only their y coordinates are kept per depth
+    y_positions = depth_offset + angle_variation[None, :]
+    y_px = y_positions * pixels_per_cm_y
 
     # Draw all projection lines on the overlay image
-    for i, points in enumerate(all_projection_curves):
+    x_list = x_px.tolist()
+    for i, curve_y in enumerate(y_px):
         color = colors[i % len(colors)]
-        for j in range(len(points) - 1):
-            draw.line([points[j], points[j + 1]], fill=color, width=line_thickness)
+        points = list(zip(x_list, curve_y.tolist()))
+        # Draw the whole curve as one connected polyline
+        draw.line(points, fill=color, width=line_thickness, joint="curve")
 
         # Label the depth level with specified font size
         label_x = 20
-        label_y = points[0][1] - (100 + 10)  # Adjusted position for larger font
-        if label_y < 0:
-            label_y = points[0][1] + 20
+        label_y = curve_y[0] + 10  # Adjusted position for larger font
+        if label_y + 100 > img_height:
+            label_y = curve_y[0] - (100 + 20)
 
         # Draw text with the specified font
         draw.text(
             (label_x, label_y), f"Depth: {depth_levels[i]} cm", fill=color, font=font
         )
 
+    # Interpolate the curves to every image column so band masks can be built
+    # with a single vectorized comparison against the row indices
+    column_x = np.arange(img_width)
+    column_curves = np.array(
+        [np.interp(column_x, x_px, curve_y) for curve_y in y_px], dtype=np.float32
+    )
+    row_y = np.arange(img_height)[:, None]
+
+    # Read the source pixels once as an RGBA array and slice it per region below
+    # (convert() always copies, so skip it when the image is already RGBA)
+    src = np.asarray(img if img.mode == "RGBA" else img.convert("RGBA"))
+
     # Extract regions between consecutive depth levels
     for i in range(len(depth_levels) - 1):
         start_depth = depth_levels[i]
         end_depth = depth_levels[i + 1]
         color = colors[i % len(colors)]
 
-        # Get the projection curves for this region
-        upper_curve = all_projection_curves[i]
-        lower_curve = all_projection_curves[i + 1]
-
-        # Create a mask for the extraction zone (region between consecutive depths)
-        mask = Image.new("L", img.size, 0)
-        mask_draw = ImageDraw.Draw(mask)
-
-        # Create a polygon connecting the upper and lower curves
-        polygon_points = []
-        polygon_points.extend(upper_curve)  # Add upper curve points
-        polygon_points.extend(lower_curve[::-1])  # Add lower curve points in reverse
+        # Get the per-column bounds of this region
+        upper = np.minimum(column_curves[i], column_curves[i + 1])
+        lower = np.maximum(column_curves[i], column_curves[i + 1])
 
-        # Draw the polygon as the extraction zone
-        mask_draw.polygon(polygon_points, fill=255)
+        # Restrict the work to the rows spanned by this region
+        y0 = min(max(int(np.floor(upper.min())), 0), img_height - 1)
+        y1 = min(max(int(np.ceil(lower.max())) + 1, y0 + 1), img_height)
 
-        # Extract the section using the mask
-        extracted = Image.new("RGBA", img.size, (0, 0, 0, 0))
-        extracted.paste(img, (0, 0), mask)
+        # Create a mask for the extraction zone (region between consecutive depths)
+        band_rows = row_y[y0:y1]
+        mask_slice = (band_rows >= upper[None, :]) & (band_rows < lower[None, :])
 
-        # FIXED: Flip the image vertically so top is top and bottom is bottom
-        extracted = extracted.transpose(Image.FLIP_TOP_BOTTOM)
+        # Extract the section by clearing pixels outside the mask
+        band = np.where(mask_slice[..., None], src[y0:y1], 0)
+        extracted = Image.fromarray(band, "RGBA")
 
         # Save the extracted section
         extracted_path = os.path.join(
             output_dir, f"depth_{start_depth}cm_to_{end_depth}cm.png"
         )
-        extracted.save(extracted_path)
+        extracted.save(extracted_path, compress_level=compress_level)
         extracted_sections.append((extracted_path, start_depth, end_depth))
 
-    # FIXED: Flip the overlay image to match the orientation of extracted sections
-    overlay_img = overlay_img.transpose(Image.FLIP_TOP_BOTTOM)
-
     # Save the overlay image
     overlay_path = os.path.join(output_dir, "depth_overlay.png")
-    overlay_img.save(overlay_path)
+    overlay_img.save(overlay_path, compress_level=compress_level)
 
     # Create a combined visualization showing all extracted sections
-    create_combined_visualization(extracted_sections, output_dir)
+    create_combined_visualization(
+        extracted_sections, output_dir, dpi=dpi, fast_mode=fast_mode
+    )
 
     return overlay_path, [path for path, _, _ in extracted_sections]
 
 
-def create_combined_visualization(section_infos, output_dir):
+def create_combined_visualization(section_infos, output_dir, dpi=200, fast_mode=True):
     """
     Create a combined visualization of all extracted sections.
 
     Args:
         section_infos (list): List of tuples (path, start_depth, end_depth)
         output_dir (str): Directory to save the visualization
+        dpi (int): Resolution of the saved figure (cost grows with dpi squared);
+            ignored when fast_mode is True
+        fast_mode (bool): Stack the sections directly with Pillow instead of
+            rendering a matplotlib figure
     """
     # Sort sections by depth (shallow to deep)
     section_infos = sorted(section_infos, key=lambda x: x[1])
 
+    if fast_mode:
+        _stack_sections_vertically(
+            section_infos, os.path.join(output_dir, "all_depths.png")
+        )
+        return
+
     # Create a figure with subplots for each section
     fig, axes = plt.subplots(
         len(section_infos), 1, figsize=(20, 6 * len(section_infos))
@@ -308,33 +438,15 @@ def create_combined_visualization(section_infos, output_dir):
 
         # Get the bounding box of non-transparent pixels
         if img.mode == "RGBA":
-            # Get alpha channel data
-            alpha = np.array(img.getchannel("A"))
-            # Find non-transparent pixels
-            non_empty_columns = np.where(alpha.max(axis=0) > 0)[0]
-            non_empty_rows = np.where(alpha.max(axis=1) > 0)[0]
-
-            # Check if there are any non-transparent pixels
-            if len(non_empty_rows) > 0 and len(non_empty_columns) > 0:
-                # Get bounding box
-                crop_box = (
-                    non_empty_columns.min(),
-                    non_empty_rows.min(),
-                    non_empty_columns.max() + 1,
-                    non_empty_rows.max() + 1,
-                )
-                # Crop image to bounding box
+            crop_box = img.getbbox()
+            # Crop image to bounding box if there are any non-transparent pixels
+            if crop_box:
                 img = img.crop(crop_box)
 
-        # Resize the image to make it larger
-        scale_factor = 2
-        new_size = (img.width * scale_factor, img.height * scale_factor)
-        img = img.resize(new_size, Image.LANCZOS)
-
         # Convert to numpy array for matplotlib
         img_array = np.array(img)
 
-        # Display the image
+        # Display the image, letting matplotlib resample it once at save time
         axes[i].imshow(img_array)
         axes[i].set_title(
             f"Soil Depth: {start_depth} cm to {end_depth} cm", fontsize=20
@@ -342,11 +454,52 @@ def create_combined_visualization(section_infos, output_dir):
         axes[i].axis("off")
 
     plt.tight_layout()
-    # Higher DPI for better quality
-    plt.savefig(os.path.join(output_dir, "all_depths.png"), dpi=1000)
+    plt.savefig(os.path.join(output_dir, "all_depths.png"), dpi=dpi)
     plt.close()
 
 
+def _stack_sections_vertically(section_infos, output_path, title_height=60):
+    """
+    Stack cropped sections top to bottom on a white canvas, each under a title.
+
+    Args:
+        section_infos (list): List of tuples (path, start_depth, end_depth), in order
+        output_path (str): Path to save the stacked image
+        title_height (int): Height in pixels of the title strip above each section
+    """
+    font = _load_font(title_height * 2 // 3)
+
+    # Load each section cropped to its non-transparent pixels
+    sections = []
+    for path, start_depth, end_depth in section_infos:
+        img = Image.open(path).convert("RGBA")
+        crop_box = img.getbbox()
+        if crop_box:
+            img = img.crop(crop_box)
+        sections.append((img, f"Soil Depth: {start_depth} cm to {end_depth} cm"))
+
+    total_width = max(img.width for img, _ in sections)
+    total_height = sum(img.height + title_height for img, _ in sections)
+    canvas = Image.new("RGB", (total_width, total_height), (255, 255, 255))
+    draw = ImageDraw.Draw(canvas)
+
+    # Paste each section under its centered title
+    y_offset = 0
+    for img, title in sections:
+        title_width = draw.textlength(title, font=font)
+        draw.text(
+            ((total_width - title_width) / 2, y_offset + title_height / 6),
+            title,
+            fill=(0, 0, 0),
+            font=font,
+        )
+        y_offset += title_height
+        canvas.paste(img, ((total_width - img.width) // 2, y_offset), img)
+        y_offset += img.height
+
+    canvas.save(output_path)
+
+
 def process_tube_images(
     input_dir,
     output_dir="processed_tube",
@@ -357,6 +510,10 @@ def process_tube_images(
     max_depth_cm=200,
     image_width_cm=18.0,
     line_thickness=20,
+    dpi=200,
+    fast_mode=True,
+    compress_level=1,
+    save_combined=True,
 ):
     """
     Main function to process multiple tube segment images:
@@ -373,6 +530,11 @@ def process_tube_images(
         max_depth_cm (float): Maximum soil depth to map in cm
         image_width_cm (float): Physical width of the image in cm
         line_thickness (int): Thickness of depth lines in pixels
+        dpi (int): Resolution of the combined all_depths.png visualization
+        fast_mode (bool): Build all_depths.png with Pillow instead of matplotlib
+        compress_level (int): PNG compression level (0-9) for the saved images;
+            the default favours speed, pass 6 for smaller final deliverables
+        save_combined (bool): Also write the stitched image to combined_tube.png
 
     Returns:
         tuple: (overlay_image_path, list_of_extracted_section_paths)
@@ -380,18 +542,16 @@ def process_tube_images(
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
 
-    # 1. Combine the tube segment images
-    combined_image_path = os.path.join(output_dir, "combined_tube.png")
-    combined_image_path = combine_tube_images(
-        input_dir,
-        pattern=pattern,
-        output_path=combined_image_path,
-        stitch_direction="horizontal",
-    )
+    # 1. Combine the tube segment images, keeping the result in memory
+    combined = _combine_tube_images(input_dir, pattern, "horizontal")
+    if save_combined:
+        combined_image_path = os.path.join(output_dir, "combined_tube.png")
+        combined.save(combined_image_path, compress_level=compress_level)
+        print(f"Combined image saved to {combined_image_path}")
 
     # 2. Process the combined image to map soil depths and extract cross-sections
-    overlay_path, section_paths = map_soil_depths_to_image(
-        combined_image_path,
+    overlay_path, section_paths = _map_soil_depths(
+        combined,
         output_dir=output_dir,
         cylinder_angle_deg=cylinder_angle_deg,
         cylinder_diameter_cm=cylinder_diameter_cm,
@@ -400,6 +560,9 @@ def process_tube_images(
         image_height_cm=None,  # Will be calculated based on aspect ratio
         image_width_cm=image_width_cm,
         line_thickness=line_thickness,
+        dpi=dpi,
+        fast_mode=fast_mode,
+        compress_level=compress_level,
     )
 
     return overlay_path, section_paths
@@ -440,6 +603,28 @@ if __name__ == "__main__":
         action="store_true",
         help="Process a single image instead of combining multiple",
     )
+    parser.add_argument(
+        "--dpi",
+        type=int,
+        default=200,
+        help="Resolution of the combined all_depths.png visualization",
+    )
+    parser.add_argument(
+        "--matplotlib_visualization",
+        action="store_true",
+        help="Render all_depths.png as a matplotlib figure instead of a Pillow stack",
+    )
+    parser.add_argument(
+        "--compress_level",
+        type=int,
+        default=1,
+        help="PNG compression level (0-9) for saved images; 6 gives smaller files",
+    )
+    parser.add_argument(
+        "--skip_combined",
+        action="store_true",
+        help="Do not write the stitched combined_tube.png when combining images",
+    )
 
     args = parser.parse_args()
 
@@ -460,6 +645,9 @@ if __name__ == "__main__":
             depth_interval_cm=args.interval,
             max_depth_cm=args.max_depth,
             image_width_cm=args.img_width,
+            dpi=args.dpi,
+            fast_mode=not args.matplotlib_visualization,
+            compress_level=args.compress_level,
         )
         print(f"Processed single image: {image_files[0]}")
     else:
@@ -473,6 +661,10 @@ if __name__ == "__main__":
             depth_interval_cm=args.interval,
             max_depth_cm=args.max_depth,
             image_width_cm=args.img_width,
+            dpi=args.dpi,
+            fast_mode=not args.matplotlib_visualization,
+            compress_level=args.compress_level,
+            save_combined=not args.skip_combined,
         )
 
     print(f"Processing complete. Results saved to {args.output_dir}")